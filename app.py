@@ -1,12 +1,22 @@
-import json
-import math
 import pathlib
 from datetime import date
+from html import escape
+from typing import Optional, Union
 
-import folium
+import numpy as np
 import pandas as pd
+import pydeck as pdk
+import requests
 import streamlit as st
-from streamlit_folium import st_folium
+from requests.adapters import HTTPAdapter
+
+from schema import (
+    BOOL_COLUMNS,
+    CATEGORY_COLUMNS,
+    LIST_COLUMNS,
+    NUMERIC_DTYPES,
+    TEXT_COLUMNS,
+)
 
 # ---------------------------------------------------------------------------
 # Konfiguration
@@ -18,106 +28,202 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+
 # ---------------------------------------------------------------------------
-# Custom CSS – nur noch für Detail-Abschnitte, kein HTML in Kacheln mehr
+# Custom CSS (style.css) – Detail-Abschnitte, auch als Rahmen der Kacheln
 # ---------------------------------------------------------------------------
-st.markdown("""<style>
-button[title="Settings"] {display: none !important;}
-button[kind="header"] {display: none !important;}
-footer {visibility: hidden;}
-.detail-section {
-    background: var(--secondary-background-color, #f0f2f6);
-    border-radius: 12px;
-    padding: 1.5rem;
-    margin-bottom: 1rem;
-}
-.detail-section p {
-    margin: 0.5rem 0;
-    line-height: 1.6;
-}
-.detail-section h4 {
-    margin-top: 0;
-    margin-bottom: 1rem;
-}
-</style>""", unsafe_allow_html=True)
+@st.cache_data
+def load_css() -> str:
+    """Liest style.css einmal ein."""
+    return pathlib.Path(__file__).with_name("style.css").read_text(encoding="utf-8")
+
+
+st.html(f"<style>{load_css()}</style>")
 
 
 # ---------------------------------------------------------------------------
 # Hilfsfunktionen
 # ---------------------------------------------------------------------------
-def haversine_distance(lat1, lon1, lat2, lon2):
-    """Berechnet die Entfernung zwischen zwei Koordinaten in Kilometern."""
+def haversine_vec(lat1, lon1, lats, lons):
+    """Berechnet die Entfernungen von einem Punkt zu vielen Koordinaten in Kilometern.
+
+    Alle Koordinaten werden im Bogenmaß erwartet.
+    """
     R = 6371
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(math.radians(lat1))
-        * math.cos(math.radians(lat2))
-        * math.sin(dlon / 2) ** 2
-    )
-    c = 2 * math.asin(math.sqrt(a))
-    return R * c
+    # Rechnet in zwei Puffern mit out=/In-place-Operationen, statt für jeden
+    # Zwischenschritt (dlat, dlon, sin, cos, a, c) ein neues Array anzulegen.
+    a = np.subtract(lats, lat1)
+    a *= 0.5
+    np.sin(a, out=a)
+    a *= a
+    b = np.subtract(lons, lon1)
+    b *= 0.5
+    np.sin(b, out=b)
+    b *= b
+    b *= np.cos(lats)
+    b *= np.cos(lat1)
+    a += b
+    np.sqrt(a, out=a)
+    np.arcsin(a, out=a)
+    a *= 2 * R
+    return a
+
+
+def tag_column(col: str, tag: str) -> str:
+    """Name der One-Hot-Spalte für einen Eintrag einer Listen-Spalte."""
+    return f"{col}:{tag}"
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """HTTP-Session mit Keep-Alive für Bildabrufe, einmal je Prozess."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    return session
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_image(url: str) -> Union[bytes, str]:
+    """Lädt ein Bild herunter; je URL höchstens einmal pro Stunde.
+
+    Schlägt der Abruf fehl, wird die URL selbst gecacht und zurückgegeben;
+    dann lädt der Browser das Bild, ohne dass jeder Rerun erneut wartet.
+    """
+    try:
+        response = get_http_session().get(url, timeout=5)
+        response.raise_for_status()
+    except requests.RequestException:
+        return url
+    # SVG (z. B. von placehold.co) nimmt st.image nur als Markup-String an
+    if "svg" in response.headers.get("Content-Type", ""):
+        return response.text
+    return response.content
 
 
-def render_card(heim):
-    """Rendert eine Kachel mit nativen Streamlit-Komponenten."""
-    with st.container(border=True):
-        st.subheader(heim["name"], divider="blue")
+# ---------------------------------------------------------------------------
+# Daten laden
+# ---------------------------------------------------------------------------
+# Spalten, die die App anzeigt oder filtert; alles andere bleibt auf der Platte
+REQUIRED_COLUMNS = [
+    "id", "verfuegbar_ab",
+    *(col for col in NUMERIC_DTYPES if col != "zimmergroesse_qm"),
+    *TEXT_COLUMNS, *LIST_COLUMNS, *CATEGORY_COLUMNS, *BOOL_COLUMNS,
+]
+
+# Spezialisierungen, wie sie auf der Detailseite aufgeführt werden
+SPEZ_LABELS = {
+    "traumapaedagogik": "Traumapädagogik",
+    "psychiatrienahe_betreuung": "Psychiatrienahe Betreuung",
+    "autismus": "Autismus",
+    "geistige_behinderung": "Geistige Behinderung",
+    "koerperliche_einschraenkungen": "Körperliche Einschränkungen",
+    "sprachunterstuetzung": "Sprachunterstützung",
+}
 
-        # Ort
-        st.markdown(f"📍 **{heim['stadt']}**, {heim['bundesland']}")
-        if "distance_km" in heim and pd.notna(heim.get("distance_km")):
-            st.caption(f"🧭 {heim['distance_km']:.1f} km entfernt")
 
-        st.divider()
+@st.cache_resource
+def load_data() -> pd.DataFrame:
+    # Erzeugt von scripts/build_data.py aus demo_data.json; die Datentypen
+    # legt schema.apply_schema dort bereits fest. Als Ressource gecacht, damit
+    # jeder Rerun dasselbe Objekt bekommt statt einer Kopie; df_all wird nie
+    # verändert, gefiltert wird nur über Masken.
+    data_path = pathlib.Path(__file__).parent / "data" / "demo_data.parquet"
+    df = pd.read_parquet(data_path, engine="pyarrow", columns=REQUIRED_COLUMNS)
+    for col in LIST_COLUMNS:
+        # Listen einmalig als boolesche Spalten je Eintrag aufklappen, damit die
+        # Filter ohne Python-Schleife über alle Zeilen auskommen.
+        exploded = df[col].explode()
+        tags = pd.get_dummies(exploded, dtype=bool).groupby(level=0).any()
+        tags.columns = [tag_column(col, t) for t in tags.columns]
+        df = df.join(tags)
+
+    # Anzeigetexte der Detailseite einmal für alle Zeilen vorberechnen
+    flags = df[list(SPEZ_LABELS)].to_numpy(dtype=bool)
+    labels = np.array(list(SPEZ_LABELS.values()), dtype=object)
+    df["_spez_label"] = [", ".join(labels[row]) for row in flags]
+    for col in ("hilfeform", "aufnahmeart"):
+        df[f"_{col}_label"] = df[col].map(", ".join)
+    # Index über die id, damit die Detailseite per Hash-Lookup statt Scan zugreift
+    return df.set_index("id", drop=False)
 
-        # Status
-        if heim["freie_plaetze"] > 0:
-            st.markdown(f"✅ **{heim['freie_plaetze']} freie Plätze**")
-        else:
-            st.markdown("❌ **Belegt**")
-        st.markdown(f"🏷️ {heim['betreuungsart']}")
-        if heim.get("inobhutnahme_geeignet"):
-            st.markdown("🚨 Inobhutnahme geeignet")
 
-        st.divider()
+df_all = load_data()
 
-        # Details
-        c1, c2 = st.columns(2)
-        with c1:
-            st.markdown(f"👤 **{heim['alter_min']}–{heim['alter_max']}** Jahre")
-        with c2:
-            st.markdown(f"📅 ab **{heim['verfuegbar_ab']}**")
-            st.markdown(f"⏱️ **{heim['verfuegbar_monate']}** Monate")
 
-        st.divider()
+@st.cache_resource
+def get_coords_rad() -> tuple[np.ndarray, np.ndarray]:
+    """Koordinaten aller Einrichtungen im Bogenmaß, einmal je Prozess umgerechnet."""
+    return (
+        np.radians(df_all["latitude"].to_numpy(dtype=np.float64)),
+        np.radians(df_all["longitude"].to_numpy(dtype=np.float64)),
+    )
 
-        st.button(
-            "Details anzeigen",
-            key=f"btn_{heim['id']}",
-            on_click=go_to_detail,
-            args=(heim["id"],),
-            use_container_width=True,
-        )
 
+# Begrenzt, da jeder frei eingegebene Suchort ein Array über alle Einrichtungen belegt
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_distances(user_lat: float, user_lon: float) -> np.ndarray:
+    """Entfernungen aller Einrichtungen zum Suchort, je Suchort nur einmal berechnet."""
+    lats, lons = get_coords_rad()
+    return haversine_vec(np.radians(user_lat), np.radians(user_lon), lats, lons)
 
-# ---------------------------------------------------------------------------
-# Daten laden
-# ---------------------------------------------------------------------------
-@st.cache_data
-def load_data() -> pd.DataFrame:
-    data_path = pathlib.Path(__file__).parent / "data" / "demo_data.json"
-    with open(data_path, encoding="utf-8") as f:
-        records = json.load(f)
-    df = pd.DataFrame(records)
-    df["verfuegbar_ab"] = pd.to_datetime(df["verfuegbar_ab"]).dt.date
-    for col in ("hilfeform", "aufnahmeart", "schulform_unterstuetzung"):
-        df[col] = df[col].apply(lambda x: x if isinstance(x, list) else [])
-    return df
 
+def has_any_tag(col: str, tags: list[str]) -> np.ndarray:
+    """Maske der Einrichtungen, deren Listen-Spalte mindestens einen der Einträge enthält."""
+    tag_cols = [tag_column(col, t) for t in tags if tag_column(col, t) in df_all.columns]
+    return df_all[tag_cols].to_numpy(dtype=bool).any(axis=1)
+
+
+def column_tags(col: str) -> list[str]:
+    """Alle Einträge einer Listen-Spalte, abgelesen an ihren One-Hot-Spalten."""
+    prefix = tag_column(col, "")
+    return [c[len(prefix):] for c in df_all.columns if c.startswith(prefix)]
+
+
+@st.cache_data
+def get_filter_options() -> dict:
+    """Auswahlmöglichkeiten und Wertebereiche der Sidebar, einmal aus df_all abgeleitet."""
+    return {
+        "bundeslaender": sorted(df_all["bundesland"].unique()),
+        "landkreise": sorted(df_all["landkreis"].dropna().unique()),
+        "landkreise_by_bl": {
+            bl: sorted(grp["landkreis"].dropna().unique())
+            for bl, grp in df_all.groupby("bundesland", observed=True)
+        },
+        "schulformen": sorted(column_tags("schulform_unterstuetzung")),
+        "einrichtungstypen": sorted(df_all["einrichtungstyp"].unique()),
+        "kontaktzeit": sorted(df_all["kontaktzeitfenster"].dropna().unique()),
+        "monate_max": int(df_all["verfuegbar_monate"].max()),
+        "alter_min": int(df_all["alter_min"].min()),
+        "alter_max": int(df_all["alter_max"].max()),
+        "plaetze_max": int(df_all["freie_plaetze"].max()),
+    }
+
+
+@st.cache_resource
+def get_card_parts() -> tuple[pd.Series, pd.Series]:
+    """Kopf und Rumpf aller Kacheln, einmal spaltenweise für alle Einrichtungen gebaut.
+
+    Dazwischen gehört nur noch die Entfernung, die vom Suchort abhängt.
+    """
+    def text(col: str) -> pd.Series:
+        return df_all[col].astype(str).map(escape)
+
+    frei = df_all["freie_plaetze"]
+    status = np.where(frei > 0, "✅ <b>" + frei.astype(str) + " freie Plätze</b>", "❌ <b>Belegt</b>")
+    inobhut = np.where(df_all["inobhutnahme_geeignet"], "<br>🚨 Inobhutnahme geeignet", "")
+
+    head = (
+        '<div class="detail-section"><h4>' + text("name") + "</h4>"
+        + "<p>📍 <b>" + text("stadt") + "</b>, " + text("bundesland")
+    )
+    body = (
+        "</p><p>" + status + "<br>🏷️ " + text("betreuungsart") + inobhut + "</p>"
+        + "<p>👤 <b>" + df_all["alter_min"].astype(str) + "–" + df_all["alter_max"].astype(str)
+        + "</b> Jahre<br>📅 ab <b>" + df_all["verfuegbar_ab"].dt.strftime("%d.%m.%Y")
+        + "</b> · ⏱️ <b>" + df_all["verfuegbar_monate"].astype(str) + "</b> Monate</p></div>"
+    )
+    return head, body
 
-df_all = load_data()
 
 # ---------------------------------------------------------------------------
 # Session-State
@@ -138,12 +244,18 @@ def go_to_overview():
     st.session_state.page = "uebersicht"
 
 
+def set_card_page(page_idx: int):
+    st.session_state.card_page = page_idx
+
+
 # ---------------------------------------------------------------------------
 # Sidebar – Filter
 # ---------------------------------------------------------------------------
+filter_options = get_filter_options()
+
 with st.sidebar:
     st.image(
-        "https://placehold.co/280x80/2196F3/white?text=Jugendheim+Vermittlung",
+        str(pathlib.Path(__file__).parent / "assets" / "logo.svg"),
         use_container_width=True,
     )
 
@@ -160,7 +272,7 @@ with st.sidebar:
     )
     min_monate = st.slider(
         "Reservierbar wie lange (Monate)", 1,
-        int(df_all["verfuegbar_monate"].max()), 1, key="f_mon",
+        filter_options["monate_max"], 1, key="f_mon",
     )
 
     st.divider()
@@ -172,14 +284,16 @@ with st.sidebar:
         umkreis_km = st.slider("Umkreis (km)", 5, 500, 100, key="f_umkr_km")
         user_lat = st.number_input("Latitude", value=51.1657, format="%.4f", key="u_lat")
         user_lon = st.number_input("Longitude", value=10.4515, format="%.4f", key="u_lon")
-    bundeslaender = sorted(df_all["bundesland"].unique())
-    sel_bundesland = st.multiselect("Bundesland", bundeslaender, key="f_bl")
+    sel_bundesland = st.multiselect(
+        "Bundesland", filter_options["bundeslaender"], key="f_bl",
+    )
     if sel_bundesland:
-        lk_opts = sorted(
-            df_all[df_all["bundesland"].isin(sel_bundesland)]["landkreis"].dropna().unique()
-        )
+        lk_opts = sorted({
+            lk for bl in sel_bundesland
+            for lk in filter_options["landkreise_by_bl"].get(bl, [])
+        })
     else:
-        lk_opts = sorted(df_all["landkreis"].dropna().unique())
+        lk_opts = filter_options["landkreise"]
     sel_landkreis = st.multiselect("Landkreis", lk_opts, key="f_lk")
 
     st.divider()
@@ -188,9 +302,9 @@ with st.sidebar:
     st.caption("Altersbereich")
     alter_range = st.slider(
         "Alter (min – max)",
-        int(df_all["alter_min"].min()),
-        int(df_all["alter_max"].max()),
-        (int(df_all["alter_min"].min()), int(df_all["alter_max"].max())),
+        filter_options["alter_min"],
+        filter_options["alter_max"],
+        (filter_options["alter_min"], filter_options["alter_max"]),
         key="f_alter",
     )
 
@@ -240,10 +354,9 @@ with st.sidebar:
         keine_gewalt = st.checkbox("Keine Gewaltproblematik", key="f_kgew")
         keine_sucht = st.checkbox("Keine Suchtthematik", key="f_ksuc")
         schulbesuch = st.checkbox("Schulbesuch möglich", key="f_schul")
-        schulformen = sorted(set(
-            s for sub in df_all["schulform_unterstuetzung"] for s in sub
-        ))
-        sel_schulform = st.multiselect("Schulform-Unterstützung", schulformen, key="f_sf")
+        sel_schulform = st.multiselect(
+            "Schulform-Unterstützung", filter_options["schulformen"], key="f_sf",
+        )
         haustiere = st.checkbox("Haustiere erlaubt", key="f_tier")
 
         st.divider()
@@ -273,7 +386,7 @@ with st.sidebar:
         st.caption("Administrativ")
         sel_einrichtungstyp = st.multiselect(
             "Einrichtungstyp",
-            sorted(df_all["einrichtungstyp"].unique()),
+            filter_options["einrichtungstypen"],
             key="f_etyp",
         )
         traeger_f = st.multiselect(
@@ -286,10 +399,9 @@ with st.sidebar:
             ["egal", "24 Stunden", "3 Tagen", "7 Tagen"],
             key="f_best",
         )
-        kontaktzeit_opts = sorted(df_all["kontaktzeitfenster"].dropna().unique())
         sel_kontaktzeit = st.multiselect(
             "Kontaktzeitfenster",
-            kontaktzeit_opts,
+            filter_options["kontaktzeit"],
             key="f_kontakt",
         )
 
@@ -300,106 +412,289 @@ with st.sidebar:
                 del st.session_state[k]
         st.rerun()
 
+
 # ---------------------------------------------------------------------------
 # Daten filtern
 # ---------------------------------------------------------------------------
-df = df_all.copy()
-
-# 1 – Verfügbarkeit
-if nur_frei_jetzt:
-    df = df[df["freie_plaetze_jetzt"]]
-if verfuegbar_ab_filter:
-    df = df[df["verfuegbar_ab"] <= verfuegbar_ab_filter]
-df = df[df["verfuegbar_monate"] >= min_monate]
-
-# 2 – Ort und Erreichbarkeit
-if sel_bundesland:
-    df = df[df["bundesland"].isin(sel_bundesland)]
-if sel_landkreis:
-    df = df[df["landkreis"].isin(sel_landkreis)]
+@st.cache_data(max_entries=256, show_spinner=False)
+def filter_mask(
+    active_flags: tuple[str, ...],
+    krisenplatz: bool,
+    selections: dict[str, list],
+    min_monate: int,
+    alter_range: tuple[int, int],
+    verfuegbar_ab_filter: Optional[date],
+    tag_selections: dict[str, list],
+    umkreis: Optional[tuple[float, float, int]],
+) -> np.ndarray:
+    """Boolesche Maske über df_all für einen Filterzustand der Sidebar.
+
+    Gecacht je Filterzustand, damit Reruns ohne Filteränderung (z. B. ein
+    Klick auf eine Kachel) nichts neu berechnen.
+    """
+    # Alle Bedingungen werden als boolesche Maske gegen df_all aufgebaut und
+    # erst am Ende einmal angewendet, statt den DataFrame pro Filter zu kopieren.
+    # Reihenfolge: billige Merkmals-Spalten zuerst, teurere Bedingungen danach
+    # und nur, solange überhaupt noch Einrichtungen übrig sind.
+    mask = np.ones(len(df_all), dtype=bool)
+
+    # Ja/Nein-Merkmale: alle aktiven Spalten in einem Durchlauf über die
+    # boolesche Matrix prüfen
+    if active_flags:
+        mask &= df_all[list(active_flags)].to_numpy(dtype=bool).all(axis=1)
+    if krisenplatz:
+        mask &= (df_all["krisenplatz"] | df_all["notaufnahme_24_7"]).to_numpy()
+
+    # Auswahllisten (Ort, Geschlecht, Administrativ)
+    for col, selected in selections.items():
+        if selected:
+            mask &= df_all[col].isin(selected).to_numpy()
+
+    # Bereiche (Verfügbarkeit, Altersbereich, Datum)
+    mask &= df_all["verfuegbar_monate"].to_numpy() >= min_monate
+    mask &= df_all["alter_max"].to_numpy() >= alter_range[0]
+    mask &= df_all["alter_min"].to_numpy() <= alter_range[1]
+    if verfuegbar_ab_filter:
+        mask &= df_all["verfuegbar_ab"].to_numpy() <= np.datetime64(verfuegbar_ab_filter)
+
+    # Listen-Spalten (Aufnahmedauer, Hilfeform, Schulform)
+    if mask.any():
+        for col, selected in tag_selections.items():
+            if selected:
+                mask &= has_any_tag(col, selected)
+
+    # Umkreis zuletzt; die Entfernungen sind je Suchort gecacht
+    if umkreis is not None and mask.any():
+        user_lat, user_lon, umkreis_km = umkreis
+        mask &= compute_distances(user_lat, user_lon) <= umkreis_km
+
+    return mask
+
+
+# Ja/Nein-Merkmale (Verfügbarkeit, Aufnahmeart, Setting, Ausschluss,
+# Spezialisierungen, Personal, Platzbestätigung)
+flag_filters = {
+    "freie_plaetze_jetzt": nur_frei_jetzt,
+    "inobhutnahme_geeignet": inobhutnahme,
+    "einzelplatz_moeglich": einzelplatz,
+    "kleingruppe": kleingruppe,
+    "keine_gewaltproblematik": keine_gewalt,
+    "keine_suchtthematik": keine_sucht,
+    "schulbesuch_moeglich": schulbesuch,
+    "haustiere_erlaubt": haustiere,
+    "traumapaedagogik": trauma,
+    "psychiatrienahe_betreuung": psychiatrie,
+    "autismus": autismus_f,
+    "geistige_behinderung": geistige_beh,
+    "koerperliche_einschraenkungen": koerperlich,
+    "deutschkenntnisse_erforderlich": deutschkenntnisse,
+    "sprachunterstuetzung": sprachunterstuetzung,
+    "eins_zu_eins_moeglich": eins_zu_eins,
+    "nachtbereitschaft": nachtbereitschaft,
+    "nachtdienst": nachtdienst,
+    "deeskalationserfahrung": deeskalation,
+    "platz_bestaetigt_24h": platz_bestaetigt == "24 Stunden",
+    "platz_bestaetigt_3d": platz_bestaetigt == "3 Tagen",
+    "platz_bestaetigt_7d": platz_bestaetigt == "7 Tagen",
+}
+mask = filter_mask(
+    active_flags=tuple(col for col, active in flag_filters.items() if active),
+    krisenplatz=krisenplatz,
+    selections={
+        "bundesland": sel_bundesland,
+        "landkreis": sel_landkreis,
+        "geschlecht": sel_geschlecht,
+        "einrichtungstyp": sel_einrichtungstyp,
+        "traeger": traeger_f,
+        "kontaktzeitfenster": sel_kontaktzeit,
+    },
+    min_monate=min_monate,
+    alter_range=alter_range,
+    verfuegbar_ab_filter=verfuegbar_ab_filter,
+    tag_selections={
+        "aufnahmeart": sel_aufnahmeart,
+        "hilfeform": sel_hilfeform,
+        "schulform_unterstuetzung": sel_schulform,
+    },
+    umkreis=(user_lat, user_lon, umkreis_km) if umkreis_aktiv else None,
+)
+
+# Nur bei aktiver Umkreis-Suche entsteht eine Kopie mit Entfernungsspalte
+df = df_all.loc[mask]
 if umkreis_aktiv:
-    df["distance_km"] = df.apply(
-        lambda r: haversine_distance(user_lat, user_lon, r["latitude"], r["longitude"]),
-        axis=1,
+    df = df.assign(distance_km=compute_distances(user_lat, user_lon)[mask])
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def compute_metrics(mask: np.ndarray) -> tuple[int, int, int, int]:
+    """Kennzahlen der Übersicht, einmal je Ergebnismenge berechnet."""
+    sub = df_all.loc[mask]
+    return (
+        len(sub),
+        int(sub["freie_plaetze"].sum()),
+        sub["stadt"].nunique(),
+        sub["bundesland"].nunique(),
     )
-    df = df[df["distance_km"] <= umkreis_km]
-else:
-    df["distance_km"] = None
-
-# 3 – Altersbereich
-df = df[(df["alter_max"] >= alter_range[0]) & (df["alter_min"] <= alter_range[1])]
-
-# 4 – Aufnahmeart
-if inobhutnahme:
-    df = df[df["inobhutnahme_geeignet"]]
-if krisenplatz:
-    df = df[df["krisenplatz"] | df["notaufnahme_24_7"]]
-if sel_aufnahmeart:
-    df = df[df["aufnahmeart"].apply(lambda x: any(a in x for a in sel_aufnahmeart))]
-
-# 5 – Hilfeform und Setting
-if sel_hilfeform:
-    df = df[df["hilfeform"].apply(lambda x: any(h in x for h in sel_hilfeform))]
-if einzelplatz:
-    df = df[df["einzelplatz_moeglich"]]
-if kleingruppe:
-    df = df[df["kleingruppe"]]
-
-# 6 – Geschlecht
-if sel_geschlecht:
-    df = df[df["geschlecht"].isin(sel_geschlecht)]
-
-# 7 – Ausschluss und Mindestkriterien
-if keine_gewalt:
-    df = df[df["keine_gewaltproblematik"]]
-if keine_sucht:
-    df = df[df["keine_suchtthematik"]]
-if schulbesuch:
-    df = df[df["schulbesuch_moeglich"]]
-if sel_schulform:
-    df = df[df["schulform_unterstuetzung"].apply(lambda x: any(s in x for s in sel_schulform))]
-if haustiere:
-    df = df[df["haustiere_erlaubt"]]
-
-# 8 – Spezialisierungen
-if trauma:
-    df = df[df["traumapaedagogik"]]
-if psychiatrie:
-    df = df[df["psychiatrienahe_betreuung"]]
-if autismus_f:
-    df = df[df["autismus"]]
-if geistige_beh:
-    df = df[df["geistige_behinderung"]]
-if koerperlich:
-    df = df[df["koerperliche_einschraenkungen"]]
-if deutschkenntnisse:
-    df = df[df["deutschkenntnisse_erforderlich"]]
-if sprachunterstuetzung:
-    df = df[df["sprachunterstuetzung"]]
-
-# 9 – Betreuungskapazität und Personal
-if eins_zu_eins:
-    df = df[df["eins_zu_eins_moeglich"]]
-if nachtbereitschaft:
-    df = df[df["nachtbereitschaft"]]
-if nachtdienst:
-    df = df[df["nachtdienst"]]
-if deeskalation:
-    df = df[df["deeskalationserfahrung"]]
-
-# 10 – Administrativ
-if sel_einrichtungstyp:
-    df = df[df["einrichtungstyp"].isin(sel_einrichtungstyp)]
-if traeger_f:
-    df = df[df["traeger"].isin(traeger_f)]
-if platz_bestaetigt == "24 Stunden":
-    df = df[df["platz_bestaetigt_24h"]]
-elif platz_bestaetigt == "3 Tagen":
-    df = df[df["platz_bestaetigt_3d"]]
-elif platz_bestaetigt == "7 Tagen":
-    df = df[df["platz_bestaetigt_7d"]]
-if sel_kontaktzeit:
-    df = df[df["kontaktzeitfenster"].isin(sel_kontaktzeit)]
+
+
+# ---------------------------------------------------------------------------
+# Ansichten der Übersicht
+# ---------------------------------------------------------------------------
+CARDS_PER_PAGE = 12
+# Vorgebundene Vorlage für die Entfernungszeile, das einzige Stück Kachel-HTML,
+# das je Seite noch formatiert wird
+DISTANCE_HTML = "<br><small>🧭 {:.1f} km entfernt</small>".format
+
+
+# Als Fragmente laufen Interaktionen innerhalb einer Ansicht (Buttons,
+# Blättern) ohne erneutes Filtern der ganzen Seite.
+@st.fragment
+def render_cards_tab(df):
+    """Kachelansicht der gefilterten Einrichtungen."""
+    # Sortiert und geblättert wird nur über ids und Entfernungen als Arrays,
+    # ohne je Rerun ein sortiertes oder zerteiltes DataFrame anzulegen
+    ids = df.index.to_numpy()
+    distances = None
+    if "distance_km" in df.columns:
+        distances = df["distance_km"].to_numpy()
+        order = np.argsort(distances, kind="stable")
+        ids, distances = ids[order], distances[order]
+
+    # Nur die Kacheln der aktuellen Seite werden zusammengesetzt
+    n_pages = max(1, (len(ids) + CARDS_PER_PAGE - 1) // CARDS_PER_PAGE)
+    page_idx = min(st.session_state.get("card_page", 0), n_pages - 1)
+    st.session_state.card_page = page_idx
+    start, stop = page_idx * CARDS_PER_PAGE, (page_idx + 1) * CARDS_PER_PAGE
+    page_ids = ids[start:stop]
+
+    # Das ganze Raster der Seite als ein einziges Markdown-Element; das HTML
+    # je Einrichtung liegt schon fertig vor
+    head, body = get_card_parts()
+    if distances is None:
+        distance_html = [""] * len(page_ids)
+    else:
+        distance_html = list(map(DISTANCE_HTML, distances[start:stop]))
+    cards = map(
+        "".join,
+        zip(head.loc[page_ids].tolist(), distance_html, body.loc[page_ids].tolist()),
+    )
+    st.markdown(
+        '<div class="card-grid">' + "".join(cards) + "</div>",
+        unsafe_allow_html=True,
+    )
+
+    # Ein Auswahlfeld statt eines Buttons je Kachel; ein Link in der Kachel
+    # würde die Seite neu laden und mit der Sitzung alle Filter verwerfen
+    names = dict(zip(page_ids.tolist(), df_all.loc[page_ids, "name"].tolist()))
+    c_sel, c_btn = st.columns([3, 1], vertical_alignment="bottom")
+    heim_id = c_sel.selectbox(
+        "Einrichtung", list(names), format_func=names.get, key="card_select",
+    )
+    # Innerhalb des Fragments löst der Seitenwechsel einen vollen Rerun aus
+    if c_btn.button("Details anzeigen", key="card_detail", use_container_width=True):
+        go_to_detail(heim_id)
+        st.rerun()
+
+    if n_pages > 1:
+        c_prev, c_info, c_next = st.columns([1, 2, 1])
+        c_prev.button(
+            "← Zurück", key="card_prev", on_click=set_card_page,
+            args=(page_idx - 1,), disabled=page_idx == 0, use_container_width=True,
+        )
+        c_info.caption(f"Seite {page_idx + 1} von {n_pages}")
+        c_next.button(
+            "Weiter →", key="card_next", on_click=set_card_page,
+            args=(page_idx + 1,), disabled=page_idx >= n_pages - 1,
+            use_container_width=True,
+        )
+
+
+MAP_FARBE_FREI = [46, 160, 67]
+MAP_FARBE_BELEGT = [214, 39, 40]
+
+
+def render_map_tab(df):
+    """Kartenansicht der gefilterten Einrichtungen."""
+    # Nur die für Punkte und Tooltip nötigen Spalten an den Browser schicken;
+    # Texte escaped, da deck.gl sie als HTML in den Tooltip einsetzt
+    points = pd.DataFrame({
+        "name": df["name"].astype(str).map(escape),
+        "stadt": df["stadt"].astype(str).map(escape),
+        "freie_plaetze": df["freie_plaetze"].astype(int),
+        "betreuungsart": df["betreuungsart"].astype(str).map(escape),
+        "latitude": df["latitude"].astype(float),
+        "longitude": df["longitude"].astype(float),
+        "entfernung": "",
+    })
+    if "distance_km" in df.columns:
+        points["entfernung"] = "<br>Entfernung: " + df["distance_km"].round(1).astype(str) + " km"
+
+    # deck.gl zeichnet alle Punkte per WebGL; je Farbe eine Ebene
+    has_free = points["freie_plaetze"].to_numpy() > 0
+    layers = [
+        pdk.Layer(
+            "ScatterplotLayer",
+            data=points.loc[wanted],
+            get_position=["longitude", "latitude"],
+            get_fill_color=color,
+            get_radius=5000,
+            radius_min_pixels=5,
+            pickable=True,
+        )
+        for color, wanted in ((MAP_FARBE_FREI, has_free), (MAP_FARBE_BELEGT, ~has_free))
+        if wanted.any()
+    ]
+    st.pydeck_chart(
+        pdk.Deck(
+            map_style="light",
+            initial_view_state=pdk.ViewState(
+                latitude=points["latitude"].mean(),
+                longitude=points["longitude"].mean(),
+                zoom=5,
+            ),
+            layers=layers,
+            tooltip={
+                "html": "<b>{name}</b><br>{stadt}<br>Freie Plätze: {freie_plaetze}"
+                        "<br>{betreuungsart}{entfernung}",
+            },
+        ),
+        use_container_width=True,
+        height=550,
+    )
+
+
+@st.fragment
+def render_table_tab(df):
+    """Tabellenansicht der gefilterten Einrichtungen."""
+    column_config = {
+        "name": st.column_config.TextColumn("Name"),
+        "stadt": st.column_config.TextColumn("Stadt"),
+        "bundesland": st.column_config.TextColumn("Bundesland"),
+        "betreuungsart": st.column_config.TextColumn("Betreuungsart"),
+        "freie_plaetze": st.column_config.ProgressColumn(
+            "Freie Plätze", format="%d", min_value=0,
+            max_value=get_filter_options()["plaetze_max"],
+        ),
+        "alter_min": st.column_config.NumberColumn("Alter min", format="%d"),
+        "alter_max": st.column_config.NumberColumn("Alter max", format="%d"),
+        "verfuegbar_ab": st.column_config.DateColumn("Verfügbar ab", format="DD.MM.YYYY"),
+        "verfuegbar_monate": st.column_config.NumberColumn("Dauer (Mon.)", format="%d"),
+    }
+    if "distance_km" in df.columns:
+        column_config["distance_km"] = st.column_config.NumberColumn(
+            "Entfernung (km)", format="%.1f",
+        )
+
+    # Beschriftung und Format übernimmt das Frontend; übergeben werden nur die
+    # angezeigten Spalten, damit Listen- und Tag-Spalten nicht mit serialisiert werden.
+    # Formatierung nur über column_config: df nicht in df.style verpacken –
+    # siehe streamlit/streamlit#10952.
+    column_order = list(column_config)
+    st.dataframe(
+        df[column_order], use_container_width=True, hide_index=True,
+        column_order=column_order, column_config=column_config,
+    )
+
 
 # ---------------------------------------------------------------------------
 # Seiten-Routing
@@ -408,14 +703,15 @@ if st.session_state.page == "detail" and st.session_state.selected_id is not Non
     # -----------------------------------------------------------------------
     # DETAILSEITE
     # -----------------------------------------------------------------------
-    heim = df_all[df_all["id"] == st.session_state.selected_id]
-    if heim.empty:
+    try:
+        heim = df_all.loc[st.session_state.selected_id]
+    except KeyError:
+        heim = None
+    if heim is None:
         st.warning("Eintrag nicht gefunden.")
         go_to_overview()
         st.rerun()
     else:
-        heim = heim.iloc[0]
-
         st.button("← Zurück zur Übersicht", on_click=go_to_overview)
 
         st.title(heim["name"])
@@ -424,7 +720,11 @@ if st.session_state.page == "detail" and st.session_state.selected_id is not Non
         col_img, col_info = st.columns([1, 2])
 
         with col_img:
-            st.image(heim["bild_url"], use_container_width=True)
+            st.image(fetch_image(heim["bild_url"]), use_container_width=True)
+            # folium erst hier laden: die Übersicht braucht es nicht
+            import folium
+            from streamlit_folium import st_folium
+
             m = folium.Map(
                 location=[heim["latitude"], heim["longitude"]],
                 zoom_start=13, width=350, height=250,
@@ -434,7 +734,8 @@ if st.session_state.page == "detail" and st.session_state.selected_id is not Non
                 tooltip=heim["name"],
                 icon=folium.Icon(color="blue", icon="home", prefix="fa"),
             ).add_to(m)
-            st_folium(m, width=350, height=250, key="detail_map")
+            # Keine Rückgabewerte: Verschieben/Zoomen löst keinen Rerun aus.
+            st_folium(m, width=350, height=250, key="detail_map", returned_objects=[])
 
         with col_info:
             # Info-Box via native Streamlit
@@ -442,14 +743,14 @@ if st.session_state.page == "detail" and st.session_state.selected_id is not Non
                 st.subheader("Informationen")
                 st.markdown(f"**Adresse:** {heim['adresse']}")
                 st.markdown(f"**Betreuungsart:** {heim['betreuungsart']}")
-                st.markdown(f"**Hilfeform:** {', '.join(heim.get('hilfeform', []))}")
+                st.markdown(f"**Hilfeform:** {heim['_hilfeform_label']}")
                 st.markdown(f"**Freie Plätze:** {heim['freie_plaetze']}  ({'jetzt verfügbar' if heim.get('freie_plaetze_jetzt') else 'nicht sofort'})")
                 st.markdown(f"**Reservierbar:** {'Ja' if heim.get('reservierbar') else 'Nein'}")
                 st.markdown(f"**Altersgruppe:** {heim['alter_min']}–{heim['alter_max']} Jahre")
                 st.markdown(f"**Geschlecht:** {heim.get('geschlecht', 'offen')}")
-                st.markdown(f"**Verfügbar ab:** {heim['verfuegbar_ab']}")
+                st.markdown(f"**Verfügbar ab:** {heim['verfuegbar_ab'].strftime('%d.%m.%Y')}")
                 st.markdown(f"**Verfügbarkeit:** {heim['verfuegbar_monate']} Monate")
-                st.markdown(f"**Aufnahmeart:** {', '.join(heim.get('aufnahmeart', []))}")
+                st.markdown(f"**Aufnahmeart:** {heim['_aufnahmeart_label']}")
                 st.markdown(f"**Inobhutnahme:** {'Ja' if heim.get('inobhutnahme_geeignet') else 'Nein'}")
                 st.markdown(f"**Krisenplatz:** {'Ja' if heim.get('krisenplatz') else 'Nein'}")
                 st.markdown(f"**Notaufnahme 24/7:** {'Ja' if heim.get('notaufnahme_24_7') else 'Nein'}")
@@ -459,23 +760,10 @@ if st.session_state.page == "detail" and st.session_state.selected_id is not Non
                 st.write(heim["beschreibung"])
 
             # Spezialisierungen
-            spez = []
-            if heim.get("traumapaedagogik"):
-                spez.append("Traumapädagogik")
-            if heim.get("psychiatrienahe_betreuung"):
-                spez.append("Psychiatrienahe Betreuung")
-            if heim.get("autismus"):
-                spez.append("Autismus")
-            if heim.get("geistige_behinderung"):
-                spez.append("Geistige Behinderung")
-            if heim.get("koerperliche_einschraenkungen"):
-                spez.append("Körperliche Einschränkungen")
-            if heim.get("sprachunterstuetzung"):
-                spez.append("Sprachunterstützung")
-            if spez:
+            if heim["_spez_label"]:
                 with st.container(border=True):
                     st.subheader("Spezialisierungen")
-                    st.write(", ".join(spez))
+                    st.write(heim["_spez_label"])
 
             with st.container(border=True):
                 st.subheader("Kontakt")
@@ -527,11 +815,12 @@ else:
     )
 
     # Metriken
+    n_heime, n_frei, n_staedte, n_laender = compute_metrics(mask)
     m1, m2, m3, m4 = st.columns(4)
-    m1.metric("Einrichtungen", len(df))
-    m2.metric("Freie Plätze", int(df["freie_plaetze"].sum()))
-    m3.metric("Städte", df["stadt"].nunique())
-    m4.metric("Bundesländer", df["bundesland"].nunique())
+    m1.metric("Einrichtungen", n_heime)
+    m2.metric("Freie Plätze", n_frei)
+    m3.metric("Städte", n_staedte)
+    m4.metric("Bundesländer", n_laender)
 
     if df.empty:
         st.info("Keine Einrichtungen gefunden. Bitte passen Sie die Filter an.")
@@ -540,69 +829,12 @@ else:
             ["📋 Kachelansicht", "🗺️ Kartenansicht", "📊 Tabellenansicht"]
         )
 
-        # -- Kachelansicht --
         with tab_cards:
-            if "distance_km" in df.columns and df["distance_km"].notna().any():
-                df_display = df.sort_values("distance_km")
-            else:
-                df_display = df
-
-            rows = [df_display.iloc[i : i + 3] for i in range(0, len(df_display), 3)]
-            for row_chunk in rows:
-                cols = st.columns(3)
-                for idx, (_, heim) in enumerate(row_chunk.iterrows()):
-                    with cols[idx]:
-                        render_card(heim)
-
-        # -- Kartenansicht --
+            render_cards_tab(df)
         with tab_map:
-            center_lat = df["latitude"].mean()
-            center_lon = df["longitude"].mean()
-            fmap = folium.Map(location=[center_lat, center_lon], zoom_start=6)
-
-            for _, heim in df.iterrows():
-                color = "green" if heim["freie_plaetze"] > 0 else "red"
-                popup_html = (
-                    f"<b>{heim['name']}</b><br>"
-                    f"{heim['stadt']}<br>"
-                    f"Freie Plätze: {heim['freie_plaetze']}<br>"
-                    f"{heim['betreuungsart']}"
-                )
-                if pd.notna(heim.get("distance_km")):
-                    popup_html += f"<br>Entfernung: {heim['distance_km']:.1f} km"
-                folium.Marker(
-                    location=[heim["latitude"], heim["longitude"]],
-                    popup=folium.Popup(popup_html, max_width=250),
-                    tooltip=heim["name"],
-                    icon=folium.Icon(color=color, icon="home", prefix="fa"),
-                ).add_to(fmap)
-
-            st_folium(fmap, width=None, height=550, key="overview_map")
-
-        # -- Tabellenansicht --
+            render_map_tab(df)
         with tab_table:
-            cols_show = [
-                "name", "stadt", "bundesland", "betreuungsart",
-                "freie_plaetze",
-                "alter_min", "alter_max", "verfuegbar_ab", "verfuegbar_monate",
-            ]
-            rename = {
-                "name": "Name", "stadt": "Stadt", "bundesland": "Bundesland",
-                "betreuungsart": "Betreuungsart", "freie_plaetze": "Freie Plätze",
-                "alter_min": "Alter min",
-                "alter_max": "Alter max", "verfuegbar_ab": "Verfügbar ab",
-                "verfuegbar_monate": "Dauer (Mon.)",
-            }
-            if df["distance_km"].notna().any():
-                cols_show.append("distance_km")
-                rename["distance_km"] = "Entfernung (km)"
-
-            display_df = df[cols_show].rename(columns=rename)
-            if "Entfernung (km)" in display_df.columns:
-                display_df["Entfernung (km)"] = display_df["Entfernung (km)"].apply(
-                    lambda x: f"{x:.1f}" if pd.notna(x) else ""
-                )
-            st.dataframe(display_df, use_container_width=True, hide_index=True)
+            render_table_tab(df)
 
     # Footer
     st.divider()
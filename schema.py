@@ -0,0 +1,48 @@
+"""Spalten und Datentypen der Einrichtungsdaten."""
+import pandas as pd
+
+TEXT_COLUMNS = (
+    "name", "adresse", "beschreibung",
+    "kontakt_email", "kontakt_telefon", "bild_url",
+)
+LIST_COLUMNS = ("hilfeform", "aufnahmeart", "schulform_unterstuetzung")
+BOOL_COLUMNS = (
+    "freie_plaetze_jetzt", "reservierbar", "einzelplatz_moeglich", "kleingruppe",
+    "intensivpaedagogisch", "inobhutnahme_geeignet", "krisenplatz",
+    "notaufnahme_24_7", "keine_gewaltproblematik", "keine_suchtthematik",
+    "schulbesuch_moeglich", "haustiere_erlaubt", "traumapaedagogik",
+    "psychiatrienahe_betreuung", "autismus", "geistige_behinderung",
+    "koerperliche_einschraenkungen", "deutschkenntnisse_erforderlich",
+    "sprachunterstuetzung", "eins_zu_eins_moeglich", "nachtbereitschaft",
+    "nachtdienst", "deeskalationserfahrung", "platz_bestaetigt_24h",
+    "platz_bestaetigt_3d", "platz_bestaetigt_7d",
+)
+# Feste numerische Typen, so schon von pd.read_json eingelesen
+NUMERIC_DTYPES = {
+    "freie_plaetze": "int16",
+    "zimmergroesse_qm": "int16",
+    "alter_min": "int8",
+    "alter_max": "int8",
+    "verfuegbar_monate": "int16",
+    "latitude": "float32",
+    "longitude": "float32",
+}
+CATEGORY_COLUMNS = (
+    "stadt", "bundesland", "landkreis", "geschlecht", "betreuungsart",
+    "einrichtungstyp", "traeger", "kontaktzeitfenster",
+)
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Bringt die Rohdaten auf die Datentypen, mit denen die App arbeitet."""
+    # Schmale Datentypen halten die Filtermasken klein und schnell
+    for col in BOOL_COLUMNS:
+        df[col] = df[col].astype("bool")
+    df = df.astype(NUMERIC_DTYPES)
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype("category")
+    # Als datetime64 speichern; formatiert wird erst bei der Anzeige
+    df["verfuegbar_ab"] = pd.to_datetime(df["verfuegbar_ab"])
+    for col in LIST_COLUMNS:
+        df[col] = df[col].apply(lambda x: x if isinstance(x, list) else [])
+    return df
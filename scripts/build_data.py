@@ -0,0 +1,27 @@
+"""Erzeugt data/demo_data.parquet aus data/demo_data.json.
+
+Nach jeder Änderung an demo_data.json aus dem Projektverzeichnis ausführen:
+
+    python scripts/build_data.py
+"""
+import pathlib
+import sys
+
+import pandas as pd
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from schema import NUMERIC_DTYPES, apply_schema  # noqa: E402
+
+
+def main():
+    src = ROOT / "data" / "demo_data.json"
+    dst = src.with_suffix(".parquet")
+    df = apply_schema(pd.read_json(src, dtype=NUMERIC_DTYPES, convert_dates=False))
+    df.to_parquet(dst, engine="pyarrow", index=False)
+    print(f"{len(df)} Einrichtungen nach {dst.relative_to(ROOT)} geschrieben.")
+
+
+if __name__ == "__main__":
+    main()